@@ -136,9 +136,17 @@ alternatives(t, p):
 
 import re
 import itertools
+import numbers
 import string
-from collections import namedtuple, defaultdict
-from operator import attrgetter
+from collections import namedtuple, defaultdict, Counter
+
+# Letters in the order they are handed out to bit positions: A-Z then a-z
+_ALPHA = sorted(string.ascii_letters)
+
+# A single letter and its prime, e.g. "A" or "A'"
+_TERM_RE = re.compile(r"[A-Za-z]'*")
+# Anything between terms, e.g. " + "
+_SPLIT_RE = re.compile(r"[^a-zA-Z']+")
 
 # Term is a namedtuple used by the Quin-McCluskey reduction portion of the code.
 # A list of Terms is used for the minimize process and another list is used for
@@ -152,19 +160,23 @@ from operator import attrgetter
 # --final: (None|Required|Added). "None"--default setting; term isn't used in reduced
 #       form. "Required"--terms that are required for the reduced form. "Added"--
 #       terms that complete the reduced form using Petrick's method.
-# --binary: first generation only--binary representation of the term
+# --binary: first generation only--binary representation of the term (value as a string)
 # --row: essentially a row index
 # --dontcare: first generation only--if the term will be ignored in the reduction
+# --mask: bit per letter (A is the high order bit); set if the letter is still in the term
+# --value: bit per letter; set if the letter is un-primed. Only bits inside mask are set.
 #
 # For minimize/reduction items in the latest generation are compared. With in a
 # generation only terms where "ones" differs by 1 can be merged/minimized.
 #
-# Code relies on doing set comparisons of characters as opposed to using 1's and 0's
-# and position holders (e.g. AB'D vs. 10-1). For very large reductions (e.g.
+# Merging is decided on mask/value (e.g. AB'D in ABCD is mask 1101, value 1001) rather
+# than by doing set comparisons of characters. Two terms merge when they have the same
+# mask and their values differ by a single bit. termset is still carried along since it
+# is what the results are built from. For very large reductions (e.g.
 # quinemc(4222345678921334)) the number of permutations and comparisons grows pretty
 # large and can be slow.
 Term = namedtuple(
-    'Term', 'termset used ones source generation final binary row dontcare')
+    'Term', 'termset used ones source generation final binary row dontcare mask value')
 
 
 def canonical(item, highorder_a=True, includef=False):
@@ -182,24 +194,27 @@ def canonical(item, highorder_a=True, includef=False):
     asdf
 
     '''
-    if not isinstance(item, int):
-        return ValueError(item, "canonical(x) requires an integer.")
+    # Integral rather than int so Python 2 longs are accepted too
+    if not isinstance(item, numbers.Integral):
+        raise ValueError(item, "canonical(x) requires an integer.")
+    # Only False makes A the low order bit (0 doesn't); the tables are keyed on this
+    highorder_a = highorder_a is not False
 
-    binary = format(item, 'b')
-    binary = binary[::-1]
     # No. of letters needed is equal to the length of the binary number representing
     # the length of our number. (E.g. for 248--len('11111000') == (8 - 1) == 0b111. len('111') = 3,
     # so we will need A, B, C.
-    letters = len(format(len(binary) - 1, 'b'))
+    letters = len(format(len(format(item, 'b')) - 1, 'b'))
     if letters == 1:
         letters = 2
 
-    # Funky formatter: essentially `format('10', '05b')` to get 00010--i.e. a binary equal to
-    # the length of letters for each bit position that equals 1 in our input
-    indexes = [(format(i.start(), '0' + str(letters) + 'b')) for i in re.finditer('1', binary)]
-
-    miniterms = [_minterms_(m, highorder_a) for m in indexes[::-1]]
-    miniterms = sorted(miniterms, reverse=True)
+    # No minterms or just one need no tables
+    if item == 0:
+        miniterms = []
+    elif item > 0 and item & (item - 1) == 0:
+        miniterms = [_minterms_(format(item.bit_length() - 1, '0' + str(letters) + 'b'),
+                                highorder_a)]
+    else:
+        miniterms = _canonical_minterms_(item, letters, highorder_a)
 
     result = ' + '.join(miniterms)
 
@@ -207,15 +222,71 @@ def canonical(item, highorder_a=True, includef=False):
         result = "f(" + str(item) + ") = " + result
     return result
 
-def _minterms_(terms, highorder_a):
-    alpha = sorted(string.ascii_letters)
+def _canonical_minterms_(item, letters, highorder_a):
+    # Bit i of our input (lowest first) is minterm i
+    present = format(abs(item), '0' + str(2 ** letters) + 'b')[::-1]
+    table = _minterm_table_(letters, highorder_a)
+    if table is not None:
+        # Walk the minterms in result order and keep those whose bit is set in our input
+        terms, order = table
+        miniterms = [terms[index] for index in order if present[index] == '1']
+    else:
+        # Too many letters for one table: each minterm is the first half of its letters
+        # from one table plus the second half from another
+        first = letters // 2
+        first_table = _part_table_(first, highorder_a, 0)
+        second_table = _part_table_(letters - first, highorder_a, first)
+        if highorder_a:
+            # first letters are the high order bits
+            low_mask = (1 << (letters - first)) - 1
+            miniterms = [first_table[index >> (letters - first)] + second_table[index & low_mask]
+                         for index, bit in enumerate(present) if bit == '1']
+        else:
+            low_mask = (1 << first) - 1
+            miniterms = [first_table[index & low_mask] + second_table[index >> first]
+                         for index, bit in enumerate(present) if bit == '1']
+        miniterms = sorted(miniterms, reverse=True)
+    return miniterms
+
+# Minterm strings by index for each (letters, highorder_a) seen by canonical(), plus the
+# indexes in the order the strings appear in a result (reverse sorted). Only built for up
+# to _MINTERM_TABLE_LETTERS letters; past that most of a table would go unused.
+_MINTERM_TABLES = {}
+_MINTERM_TABLE_LETTERS = 12
+
+def _minterm_table_(letters, highorder_a):
+    if letters > _MINTERM_TABLE_LETTERS:
+        return None
+    key = (letters, highorder_a)
+    table = _MINTERM_TABLES.get(key)
+    if table is None:
+        # Funky formatter: essentially `format(2, '05b')` to get 00010--i.e. a binary equal to
+        # the length of letters for each minterm index
+        terms = tuple(_minterms_(format(index, '0' + str(letters) + 'b'), highorder_a)
+                      for index in range(2 ** letters))
+        order = tuple(sorted(range(2 ** letters), key=terms.__getitem__, reverse=True))
+        table = (terms, order)
+        _MINTERM_TABLES[key] = table
+    return table
+
+def _part_table_(letters, highorder_a, first):
+    # Like _minterm_table_ (strings only) for `letters` letters starting at _ALPHA[first]
+    key = (letters, highorder_a, first)
+    table = _MINTERM_TABLES.get(key)
+    if table is None:
+        table = tuple(_minterms_(format(index, '0' + str(letters) + 'b'), highorder_a, first)
+                      for index in range(2 ** letters))
+        _MINTERM_TABLES[key] = table
+    return table
+
+def _minterms_(terms, highorder_a, first=0):
     result = ''
     if highorder_a is False:
         terms = terms[::-1]
 
-    # convert 010 to A'BC'
+    # convert 010 to A'BC' (or B'CD' when first is 1)
     for i, term in enumerate(terms):
-        result += alpha[i]
+        result += _ALPHA[first + i]
         if term == '0':
             result += "'"
     return result
@@ -226,40 +297,72 @@ def to_cdnf(min_form, ranged=False):
     """ CONVERT BACK
     --make tuples of current terms [('A', "B'"), ("C'", "D'")] -- terms
     --find greatest letter (D)
-    --for each term above create set missing pairs [["C", "C'"], ["D", "D'"]]-->missing_list
-    -- create all combinations
-        missing_combos = list(itertools.product(*missing_list)
-    -- merge them
-        final.append([set(term) | set(missing) for missing in missing_combos])
+    --for each term above find the missing letters ("C", "D")
+    -- add each missing letter to the term both primed and un-primed
+        AB --> ABCD, ABC'D, ABCD', ABC'D'
     """
     if isinstance(min_form, str):
-        min_form = list(re.split(r"[^a-zA-Z']+", min_form))
+        min_form = _SPLIT_RE.split(min_form)
     elif isinstance(min_form, list):
         pass
     else:
-        return ValueError(min_form, "Not valid input")
+        raise ValueError(min_form, "Not valid input")
 
     letters = ("".join(min_form)).replace("'", "")
     if ranged:
         last_letter = max(letters)
         first_letter = min(letters)
         letters = [chr(i) for i in range(ord(first_letter), ord(last_letter) + 1)]
-    # list of list of letters
-    min_form = [re.findall("([A-Za-z]'*)", term_letters) for term_letters in min_form]
-
-    final = []
+    # First letter is the high order bit of a minterm's number
+    letters = sorted(set(letters))
+    bit_of = dict((letter, 1 << (len(letters) - 1 - i)) for i, letter in enumerate(letters))
+    all_bits = (1 << len(letters)) - 1
+
+    # Every term adds each missing letter both primed and un-primed, which doubles its
+    # minterms once per missing letter. Numbers rather than strings go in the set.
+    final = set()
     for term_letters in min_form:
-        missing_letters = set(("".join(term_letters)).replace("'", ""))
-        missing_list = list(set(letters) - set(missing_letters))
-        missing_list = [[q, q + "'"] for q in missing_list]
-        missing_combos = list(itertools.product(*missing_list))
-        final.extend(["".join(sorted(set(term_letters) | set(missing)))
-                      for missing in missing_combos])
+        value = 0
+        fixed = 0
+        for letter in _TERM_RE.findall(term_letters):
+            fixed |= bit_of[letter[0]]
+            if letter[-1] != "'":
+                value |= bit_of[letter[0]]
+        minterms = [value]
+        for letter in letters:
+            if not fixed & bit_of[letter]:
+                minterms += [term | bit_of[letter] for term in minterms]
+        final.update(minterms)
+        if len(final) > all_bits:
+            break
 
-    result = sorted(list(set(final)), reverse=True)
-    result = ' + '.join(result)
+    # Only now turn numbers into strings. Terms are in reverse string order, where "ABC'"
+    # comes before "ABC" but "ABC" before "AB'C", so that is numeric order with the last
+    # letter's bit flipped.
+    flip = 1 if letters else 0
+    final = [term ^ flip for term in sorted((term ^ flip for term in final), reverse=True)]
+    low = len(letters) // 2
+    if len(final) >= 1 << (len(letters) - low):
+        # Enough terms to be worth naming every combination of each half of the letters
+        high_names = _letter_table_(tuple(letters[:len(letters) - low]))
+        low_names = _letter_table_(tuple(letters[len(letters) - low:]))
+        low_bits = (1 << low) - 1
+        result = ' + '.join(high_names[term >> low] + low_names[term & low_bits]
+                            for term in final)
+    else:
+        names = [(letter, letter + "'", bit_of[letter]) for letter in letters]
+        result = ' + '.join("".join(name if term & bit else primed
+                                    for name, primed, bit in names)
+                            for term in final)
 
     return result
+
+def _letter_table_(letters):
+    # Every minterm (primed or not) of the given letters; index i is the minterm for binary i
+    terms = [""]
+    for letter in reversed(letters):
+        terms = [letter + "'" + term for term in terms] + [letter + term for term in terms]
+    return terms
 # --- END: Go from Minform to Canonical ---
 
 def quinemc(myitem, highorder_a=True, full_results=False):
@@ -292,13 +395,21 @@ def quinemc(myitem, highorder_a=True, full_results=False):
     'BC + A'
     >>> result, term_list, possibles = quinemc(248, False, True)
 
-    Invalid input will return a ValueError (e.g. quinemc(["A'BC", "AB"]) is invalid
+    Invalid input raises a ValueError (e.g. quinemc(["A'BC", "AB"]) is invalid
     because second term must contain a "C".
 
     Add code for doing dont_care items
 
     Takes int, str, or list of terms; dc--> 2 lists
     '''
+    # Nothing and everything need no reducing: quinemc(0) and quinemc(15), quinemc(255), etc.
+    if isinstance(myitem, numbers.Integral) and not full_results:
+        if myitem == 0:
+            return "0"
+        length = myitem.bit_length()
+        if length >= 4 and length & (length - 1) == 0 and myitem == (1 << length) - 1:
+            return "1"
+
     if isinstance(myitem, list) and len(myitem) == 2 and isinstance(myitem[1], list):
         dont_care = _create_dont_care_(myitem[1])
         cdnf = _convert_to_terms_(myitem[0], highorder_a)
@@ -307,21 +418,40 @@ def quinemc(myitem, highorder_a=True, full_results=False):
         cdnf = _convert_to_terms_(myitem, highorder_a)
 
     if cdnf is None:
-        return ValueError(myitem, "Invalid input")
+        raise ValueError(myitem, "Invalid input")
+
+    # Terms are kept in the order given since that decides the row order in term_list
+    key = (tuple(cdnf), frozenset(dont_care) if dont_care is not None else None)
+    if not full_results:
+        result = _MINIMIZE_CACHE.get(key)
+        if result is not None:
+            return result
 
-    test_string = "".join(sorted(re.sub("'", '', cdnf[0])))
+    # Every term needs the same letters (repeats included) as the first
+    test_letters = sorted(cdnf[0].replace("'", ""))
     for item in cdnf:
-        if test_string != "".join(sorted(re.sub("'", '', item))):
-            return ValueError("Term: ", item, " doesn't match valid test ", test_string)
+        if sorted(item.replace("'", "")) != test_letters:
+            raise ValueError("Term: ", item, " doesn't match valid test ",
+                             "".join(test_letters))
+
+    minimized = _minimize_(cdnf, dont_care)
+    if len(_MINIMIZE_CACHE) >= _MINIMIZE_CACHE_SIZE:
+        _MINIMIZE_CACHE.clear()
+    _MINIMIZE_CACHE[key] = minimized[0]
 
     if full_results:
-        return _minimize_(cdnf, dont_care)
-    return _minimize_(cdnf, dont_care)[0]
+        return minimized
+    return minimized[0]
+
+# Result strings of _minimize_ by (terms, dont cares). Only the string is kept; term_list and
+# possibles are rebuilt for full_results. Cleared once it holds _MINIMIZE_CACHE_SIZE results.
+_MINIMIZE_CACHE = {}
+_MINIMIZE_CACHE_SIZE = 256
 
 def _create_dont_care_(dontcare):
     if all(isinstance(i, str) for i in dontcare):
         result = [int(_make_binary(x), 2) for x in dontcare]
-    elif all(isinstance(i, int) for i in dontcare):
+    elif all(isinstance(i, numbers.Integral) for i in dontcare):
         result = dontcare
     else:
         result = None
@@ -331,13 +461,13 @@ def _convert_to_terms_(item_in, highorder_a):
     # need to deal with a list of ints e.g [4, 18, 27] for don't care items
     # and converting don't care from second list
     result = item_in
-    if isinstance(result, int):
+    if isinstance(result, numbers.Integral):
         result = canonical(result, highorder_a).split(' + ')
     elif isinstance(result, str):
-        result = re.split(r"[^a-zA-Z']+", result)
+        result = _SPLIT_RE.split(result)
     elif isinstance(result, list) and all(isinstance(x, str) for x in result):
         result = result
-    elif isinstance(result, list) and all(isinstance(x, int) for x in result):
+    elif isinstance(result, list) and all(isinstance(x, numbers.Integral) for x in result):
         letters = len(format(max(result), 'b'))
         temp_binary = [(format(items, '0' + str(letters) + 'b')) for items in result]
         miniterms = [_minterms_(m, highorder_a) for m in temp_binary[::-1]]
@@ -361,13 +491,15 @@ def _minimize_(cdnf, dont_care):
 
     if dont_care is not None:
         for idx, item in enumerate(term_list):
-            if int(item.binary, 2) in dont_care:
+            if item.value in dont_care:
                 term_list[idx] = item._replace(dontcare=True)
 
     # Step 2: merge terms of each generation to create next generation until no more merges
-    # are possible (_merge_terms_ and _create_new_tuples_)
+    # are possible (_merge_terms_ and _create_new_terms_). generations[gen - 1] holds the
+    # terms of generation gen so it doesn't have to be picked back out of term_list.
+    generations = [term_list[:]]
     while not done:
-        done = _merge_terms_(term_list, current_generation)
+        done = _merge_terms_(term_list, generations, current_generation)
         current_generation += 1
 
     # Step 3: Generate our final result from all terms in term_list that have not been used in
@@ -390,85 +522,112 @@ def _minimize_(cdnf, dont_care):
     return result, term_list, possibles
 
 def _create_first_generation_(terms):
-    my_letters = set(sorted(string.ascii_letters))
-    temp_terms = [set(re.findall("([A-Za-z]'*)", x))
+    temp_terms = [set(_TERM_RE.findall(x))
                   for x in terms]  # Convert to list of sets
 
     # Remove duplicate terms if called with something like quinemc("ABCD + CDBA + ABC'D + DC'AB")
     temp_terms = list(temp_terms for temp_terms, _ in itertools.groupby(temp_terms))
 
-    temp_list = [Term(x, False, len(x.intersection(my_letters)), None, 1, None,
-                      _make_binary(x), None, None) for x in temp_terms]
-    temp_list = sorted(temp_list, key=attrgetter('ones'))
-    for idx, item in enumerate(temp_list):
-        temp_list[idx] = item._replace(source=[idx], row=idx)
+    # Every term has the same letters (checked in quinemc) so the first generation shares
+    # one mask. value is read straight off the sorted tokens; binary is only kept for the
+    # full_results output.
+    letters = len(temp_terms[0]) if temp_terms else 0
+    mask = (1 << letters) - 1
+    by_ones = defaultdict(list)
+    for x in temp_terms:
+        value = 0
+        for token in sorted(x):
+            value = value << 1 | (token[-1] != "'")
+        binary = format(value, '0' + str(letters) + 'b') if letters else ''
+        by_ones[_popcount(value)].append((x, binary, value))
+
+    # Rows are handed out in "ones" order
+    temp_list = []
+    for ones in sorted(by_ones):
+        for x, binary, value in by_ones[ones]:
+            row = len(temp_list)
+            temp_list.append(Term(x, False, ones, [row], 1, None, binary, row, None,
+                                  mask, value))
     return temp_list
 
 def _make_binary(new_term):
     if isinstance(new_term, set):
-        new_term = "".join(sorted(list(new_term)))
-    new_term = re.sub("[A-Za-z]'", "0", new_term)
-    new_term = re.sub("[A-Za-z]", "1", new_term)
-    return new_term
-
-def _merge_terms_(term_list, gen):
+        new_term = "".join(sorted(new_term))
+    # One pass: a letter is a 1 unless the next character primes it
+    bits = []
+    for char in new_term:
+        if char == "'":
+            bits[-1] = "0"
+        elif char.isalpha():
+            bits.append("1")
+    return "".join(bits)
+
+def _popcount(number):
+    return bin(number).count("1")
+
+def _merge_terms_(term_list, generations, gen):
     done = False
-    new_terms = _create_new_terms_(term_list, gen)
+    new_terms = _create_new_terms_(term_list, generations[gen - 1], gen)
 
     if new_terms:
         term_list.extend(new_terms)
+        generations.append(new_terms)
     else:
         done = True
 
     return done
 
-def _create_new_terms_(orig_term_list, gen):
-    # Takes a generation and puts it into a list of lists of terms grouped by the
-    # number of "ones".
-    # Then successively compares items in one list with items from the next list to
-    # find terms that can be merged
-    used_dict = {}  # a dictionary for used items
-    sources = []  # avoid duplicate merges
+def _create_new_terms_(orig_term_list, working_list, gen):
+    # Takes a generation and indexes it by (mask, value). A term can only merge with a
+    # term that has one of its un-primed letters primed, so for each term and each of
+    # its un-primed letters there is a single lookup for partners rather than comparing
+    # every term with every term in the next "ones" group.
+    used_rows = set()  # rows of terms that were merged
+    sources = set()  # avoid duplicate merges
     result = []
 
-    working_list = [xterms for xterms in orig_term_list if xterms.generation == gen]
-    working_list = [list(group) for key, group in
-                    itertools.groupby(working_list, attrgetter('ones'))]
-    current = 0
-
-    while current < len(working_list) - 1:
-        for xterms in working_list[current]:
-            for yterms in working_list[current + 1]:
-                sym_set = yterms.termset.symmetric_difference(xterms.termset)
-                # doing list(sym_set)[0][0] == list(sym_set)[1][0]: is expensive
-                # sym_set.pop.replace seems to be "cheaper"
-                if (len(sym_set) == 2 and
-                        sym_set.pop().replace("'", "") == sym_set.pop().replace("'", "")):
-                    used_dict[xterms.row] = True
-                    used_dict[yterms.row] = True
-                    new_term = yterms.termset.intersection(xterms.termset)
-                    source = sorted(yterms.source + xterms.source)
-                    if source not in sources:
-                        sources.append(source)
-                        result.append(Term(new_term, False, len(new_term.intersection(
-                            set(string.ascii_letters))), source, (gen + 1), None, None, None, None))
-        current += 1
-    result = sorted(result, key=attrgetter('ones'))
-    for idx, _ in enumerate(result):
-        result[idx] = result[idx]._replace(row=len(orig_term_list) + idx)
+    by_bits = defaultdict(list)
+    for xterms in working_list:
+        by_bits[(xterms.mask, xterms.value)].append(xterms.row)
+
+    # (xrow, yrow) where xrow is the term with the letter primed (fewer ones)
+    pairs = []
+    for yterms in working_list:
+        bits = yterms.value
+        while bits:
+            bit = bits & -bits
+            for xrow in by_bits.get((yterms.mask, yterms.value ^ bit), ()):
+                pairs.append((xrow, yterms.row))
+            bits ^= bit
+    # Keep the order terms were produced in when each group was compared with the next
+    pairs.sort()
+
+    for xrow, yrow in pairs:
+        xterms = orig_term_list[xrow]
+        yterms = orig_term_list[yrow]
+        used_rows.add(xterms.row)
+        used_rows.add(yterms.row)
+        source = sorted(yterms.source + xterms.source)
+        key = tuple(source)
+        if key not in sources:
+            sources.add(key)
+            diff = xterms.value ^ yterms.value
+            # pairs are in row order and rows in a generation are in "ones" order, so
+            # the new generation comes out sorted by ones and rows can be handed out now
+            result.append(Term(yterms.termset.intersection(xterms.termset), False,
+                               xterms.ones, source, (gen + 1), None, None,
+                               len(orig_term_list) + len(result), None,
+                               xterms.mask & ~diff, xterms.value))
 
     # set used terms as used in orig_term_list
-    for key in used_dict:
-        current = orig_term_list[key]
-        orig_term_list[key] = Term(current.termset, True, current.ones,
-                                   current.source, current.generation, None,
-                                   current.binary, current.row, current.dontcare)
+    for row in used_rows:
+        orig_term_list[row] = orig_term_list[row]._replace(used=True)
 
     return result
 
 # ---- Finding Implicants / Final Result ---- #
-# _implicants_, _required_sources_, _make_find_dict_, and _check_combinations_ do the heavy
-# lifting to find the final reduced form
+# _implicants_, _get_columns_, _make_find_dict_, _reduce_chart_, and _check_combinations_ do
+# the heavy lifting to find the final reduced form
 def _implicants_(term_list):
     '''
     Finds terms that will cover unused cases if the essential prime implicants are not
@@ -477,14 +636,17 @@ def _implicants_(term_list):
     possible_terms = defaultdict(list)
     list_of_sources = []
 
-    for sources in [zed for zed in term_list if zed.used is False]:
-        list_of_sources += list(itertools.chain(sources.source))
+    # Rows of the prime implicants; looked up once rather than rescanning term_list
+    unused_rows = [row for row, zed in enumerate(term_list) if zed.used is False]
+    for row in unused_rows:
+        list_of_sources.extend(term_list[row].source)
 
-    dont_cares = [item.row for item in term_list if item.dontcare and item.generation == 1]
+    dont_cares = set(item.row for item in term_list if item.dontcare and item.generation == 1)
     list_of_sources = [val for val in list_of_sources if val not in dont_cares]
 
-    required = [x for x in list_of_sources if list_of_sources.count(x) == 1]
-    keep_columns = _get_columns_(term_list, required, dont_cares)
+    # 1st gen terms covered by just one prime implicant
+    required = set(x for x, count in Counter(list_of_sources).items() if count == 1)
+    keep_columns = _get_columns_(term_list, unused_rows, required, dont_cares)
 
     # if _get_columns_ ends with nothing in keep_columns it means essential prime implicants
     # are all that is needed so we are done
@@ -492,9 +654,10 @@ def _implicants_(term_list):
 
     # check if single term will "cover" remaining items e.g. qmc(2077)
     if not finished:
-        find_dict = _make_find_dict_(term_list, keep_columns)
+        find_dict = _make_find_dict_(term_list, unused_rows, keep_columns)
+        all_columns = (1 << len(keep_columns)) - 1
         for idx, val in find_dict.items():
-            if set(keep_columns) == val.sourceSet:
+            if val.sources == all_columns:
                 term_list[idx] = term_list[idx]._replace(final="Added")
                 finished = True
                 break
@@ -506,40 +669,49 @@ def _implicants_(term_list):
 
     return possible_terms
 
-def _get_columns_(term_list, required, dont_cares):
+def _get_columns_(term_list, unused_rows, required, dont_cares):
     """
     term_list -- full list of terms
-    required -- integers for terms that are essential prime implicants . . .
+    unused_rows -- rows in term_list of the terms never used in a merge
+    required -- set of integers for terms that are essential prime implicants . . .
         each required int will appear in the source list for only 1 item in needed
     """
     ignore = []
     keep = []
 
-    for index, term in [(i, v) for i, v in enumerate(term_list)
-                        if v.used is False and not v.dontcare]:
+    for index in unused_rows:
+        term = term_list[index]
+        if term.dontcare:
+            continue
         # Find Terms in "needed" that exist in required, add them to the final result,
         # and add that Term's sources to the "columns" we can now ignore (already covered
         # terms)
-        if len((set(required) & set(term.source))) >= 1:
+        if not required.isdisjoint(term.source):
             term_list[index] = term._replace(final="Required")
-            ignore += itertools.chain(term.source)
+            ignore.extend(term.source)
         # Otherwise add the sources to our list of "columns" we need to keep
         else:
-            keep += itertools.chain(term.source)
-    ignore = ignore + dont_cares
+            keep.extend(term.source)
+    ignore.extend(dont_cares)
     # create a list of the remaining 1st gen terms that we still need to find minterms for
     keep = list(set(keep) - set(ignore))
 
     return keep
 
-def _make_find_dict_(term_list, keep_columns):
+def _make_find_dict_(term_list, unused_rows, keep_columns):
     # Creates a dictionary referencing the remaining tuples that can potentially complete
-    # the minimized form.
-    search_tuple = namedtuple('search_tuple', 'sourceSet length')
+    # the minimized form. sources is a bitmask of the keep_columns the term covers (bit i
+    # for keep_columns[i]) so covers can be combined with | rather than set unions.
+    search_tuple = namedtuple('search_tuple', 'sources length')
+    column_bits = dict((col, 1 << i) for i, col in enumerate(keep_columns))
     find_dict = {}
-    for idx, item in [(i, k) for i, k in enumerate(term_list)
-                      if k.used is False and k.final is None]:
-        temp_source = set(keep_columns) & set(item.source)
+    for idx in unused_rows:
+        item = term_list[idx]
+        if item.final is not None:
+            continue
+        temp_source = 0
+        for source in item.source:
+            temp_source |= column_bits.get(source, 0)
 
         if temp_source:
             temp_tuple = search_tuple(temp_source, len(item.termset))
@@ -547,46 +719,191 @@ def _make_find_dict_(term_list, keep_columns):
 
     return find_dict
 
+def _reduce_chart_(find_dict, keep_columns):
+    """
+    Trims the chart of remaining terms (rows) and 1st gen terms still to cover (columns)
+    before _check_combinations_ searches it.
+
+    --A row is dropped when another row covers everything it covers with fewer letters.
+    Rows that tie are kept so equal length alternatives are still found.
+    --A column is dropped when every row covering some other column also covers it.
+
+    Neither changes which combinations come out shortest. Returns a dictionary of the
+    remaining rows (index: bitmask of remaining columns it covers) and a bitmask of the
+    remaining columns.
+    """
+    rows = dict((idx, val.sources) for idx, val in find_dict.items())
+    columns = (1 << len(keep_columns)) - 1
+
+    changed = True
+    while changed:
+        changed = False
+        for idx in list(rows):
+            if not rows[idx] or any(
+                    not rows[idx] & ~cover and find_dict[idx].length > find_dict[other].length
+                    for other, cover in rows.items() if other != idx):
+                del rows[idx]
+                changed = True
+
+        column_list = [1 << i for i in range(len(keep_columns)) if columns >> i & 1]
+        covered_by = dict((col, set(idx for idx, cover in rows.items() if col & cover))
+                          for col in column_list)
+        for col in column_list:
+            if any(covered_by[other] <= covered_by[col]
+                   for other in column_list if other != col and other & columns):
+                columns &= ~col
+                for idx in rows:
+                    rows[idx] &= ~col
+                changed = True
+
+    return rows, columns
+
+def _greedy_length_(rows, find_dict, columns):
+    # Length of a cover built by repeatedly taking the row that covers the most remaining
+    # columns per letter. Not necessarily the shortest but it is an upper bound for it.
+    remaining = columns
+    length = 0
+    while remaining:
+        best = max(rows, key=lambda idx: _popcount(rows[idx] & remaining) /
+                   float(max(find_dict[idx].length, 1)))
+        remaining &= ~rows[best]
+        length += find_dict[best].length
+    return length
+
+def _bits_(number):
+    # The set bits of number, lowest first, each as an int of its own
+    while number:
+        bit = number & -number
+        yield bit
+        number ^= bit
+
+# The implicant chart as searched by _check_combinations_:
+# --rows: (cover bitmask, length, term index) for each row, widest first
+# --columns: bitmask of the columns to cover
+# --column_rows: column bit -> bitmask of the rows (positions in rows) covering it
+# --order: column bits, those covered by the fewest rows first
+# --shortest: column bit -> fewest letters of any row covering it
+CoverChart = namedtuple('CoverChart', 'rows columns column_rows order shortest')
+
+def _make_chart_(rows, find_dict, columns):
+    chart_rows = sorted(((rows[idx], find_dict[idx].length, idx) for idx in rows),
+                        key=lambda row: -_popcount(row[0]))
+    column_rows = dict((col, 0) for col in _bits_(columns))
+    shortest = {}
+    for position, (cover, length, _) in enumerate(chart_rows):
+        for col in _bits_(cover):
+            column_rows[col] |= 1 << position
+            shortest[col] = min(shortest.get(col, length), length)
+    order = sorted(column_rows, key=lambda col: _popcount(column_rows[col]))
+    return CoverChart(chart_rows, columns, column_rows, order, shortest)
+
+def _next_step_(chart, missing, banned):
+    """
+    Returns (rows, letters, branch) for the missing columns, or None when some column can't
+    be covered without the banned rows. Columns none of whose allowed rows overlap each
+    need a row of their own, which gives at least how many more rows (and letters) a cover
+    needs. branch is the allowed rows (positions) of the column the fewest of them cover;
+    any cover has to take one of them.
+    """
+    taken = 0
+    rows = 0
+    letters = 0
+    fewest = None
+    for col in chart.order:
+        if not col & missing:
+            continue
+        allowed = chart.column_rows[col] & ~banned
+        if not allowed:
+            return None
+        if not allowed & taken:
+            taken |= allowed
+            rows += 1
+            letters += chart.shortest[col]
+        if fewest is None or _popcount(allowed) < _popcount(fewest):
+            fewest = allowed
+    return rows, letters, [bit.bit_length() - 1 for bit in _bits_(fewest)]
+
+def _smallest_cover_(chart, max_length, best, covered=0, length=0, size=0, banned=0):
+    """
+    Finds the fewest chart rows that cover all columns without going past max_length.
+    best[0] is the smallest size found so far; nothing that can't beat it is explored, and
+    rows in banned have already been tried further up.
+    """
+    missing = chart.columns & ~covered
+    if not missing:
+        best[0] = size
+        return
+    step = _next_step_(chart, missing, banned)
+    if step is None or size + step[0] >= best[0] or length + step[1] > max_length:
+        return
+    for row in step[2]:
+        cover, row_length, _ = chart.rows[row]
+        if length + row_length <= max_length:
+            _smallest_cover_(chart, max_length, best,
+                             covered | cover, length + row_length, size + 1, banned)
+            if size + 1 >= best[0]:
+                return
+        banned |= 1 << row
+
+def _search_covers_(chart, max_size, bound, found, covered=0, length=0, chosen=(), banned=0):
+    """
+    Branch and bound over covers of at most max_size chart rows for the shortest ones.
+    bound[0] is the shortest length found so far (to start with the greedy cover's); a
+    branch is cut as soon as it is sure to go past it. found holds the covers of length
+    bound[0] as (rows, indexes); ties are kept since they are the alternatives.
+
+    Each step branches on the rows covering one missing column, banning the rows already
+    tried for it, so every combination comes up once. Only covers without a spare row are
+    reached, but a spare row only ever makes a cover longer.
+    """
+    missing = chart.columns & ~covered
+    if not missing:
+        if length < bound[0]:
+            bound[0] = length
+            del found[:]
+        found.append((len(chosen), tuple(sorted(chosen))))
+        return
+    step = _next_step_(chart, missing, banned)
+    if (step is None or len(chosen) + step[0] > max_size or
+            length + step[1] > bound[0]):
+        return
+    for row in step[2]:
+        cover, row_length, idx = chart.rows[row]
+        if length + row_length <= bound[0]:
+            _search_covers_(chart, max_size, bound, found,
+                            covered | cover, length + row_length, chosen + (idx,), banned)
+        banned |= 1 << row
+
 def _check_combinations_(find_dict, term_list, keep_columns):
-    matches = []
     possible_terms = defaultdict(list)
-    min_length = 0
-    break_count = 0
-
-    for fixme in range(2, (len(find_dict) + 1)):
-        # adding more and more combinations isnt likely to improve (shorten) length of result
-        # so once matches are found we limit how many more sets of combinations we check
-        # there may however be funky corner cases
-        if break_count >= 2:
-            break
-        else:
-            if matches:
-                break_count += 1
-        for items in itertools.combinations(find_dict.keys(), fixme):
-            combined_sources = set()
-            temp_count = 0
-            for idx in items:
-                combined_sources.update(find_dict[idx].sourceSet)
-                temp_count += find_dict[idx].length
-            if (set(keep_columns) == combined_sources
-                    and (min_length == 0 or temp_count <= min_length)):
-                if temp_count < min_length or min_length == 0:
-                    del matches[:]
-                    min_length = temp_count
-                matches.append(items)
+    rows, columns = _reduce_chart_(find_dict, keep_columns)
+    # Nothing longer than the greedy cover can be the result
+    max_length = _greedy_length_(rows, find_dict, columns)
+    chart = _make_chart_(rows, find_dict, columns)
+
+    # adding more and more terms isnt likely to improve (shorten) length of result so only
+    # covers with at most two more terms than the smallest cover are considered. Of those
+    # the shortest are the matches, smallest covers first.
+    # there may however be funky corner cases
+    matches = []
+    best = [len(chart.rows) + 1]
+    _smallest_cover_(chart, max_length, best)
+    if best[0] <= len(chart.rows):
+        found = []
+        _search_covers_(chart, best[0] + 2, [max_length], found)
+        matches = [items for _, items in sorted(found)]
 
     if matches:
-        for idx, value in enumerate(matches):
-            for i in value:
-                if idx == 0:
-                    term_list[i] = term_list[i]._replace(final="Added")
-                possible_terms[idx].append(term_list[i])
+        for i in matches[0]:
+            term_list[i] = term_list[i]._replace(final="Added")
+        possible_terms.update((idx, [term_list[i] for i in value])
+                              for idx, value in enumerate(matches))
 
     return possible_terms
 
 def result_to_int(res):
     """
-    Takes the "result" list of Term tuples and uses the binary field from the first
+    Takes the "result" list of Term tuples and uses the value field from the first
     generation to produce integer representation.
 
     E.g.
@@ -594,7 +911,15 @@ def result_to_int(res):
     q = result_to_int(b) # q would now be 248
 
     """
-    return sum(2**(int(x.binary, 2)) for x in res if x.generation == 1)
+    # quinemc(0) has a single empty first generation term; it isn't a minterm
+    positions = [x.value for x in res if x.generation == 1 and x.mask]
+    if not positions:
+        return 0
+    # Set the bits in a string and convert once rather than adding up big ints
+    bits = ["0"] * (max(positions) + 1)
+    for position in positions:
+        bits[-1 - position] = "1"
+    return int("".join(bits), 2)
 
 def alternatives(fullterms, alts):
     """
@@ -1,50 +1,166 @@
 import pytest
-from collections import namedtuple
-from cdnf import *
+from cdnf import canonical, quinemc, to_cdnf, result_to_int, alternatives
+
+# Terms of the second alternative for quinemc(2046)
+_SECOND_2046 = frozenset(["A'D", "AB'C'", "B'CD'"])
+
+
+def _terms(expression):
+    # The terms of a sum of products, whatever order they come in
+    return frozenset(expression.replace(" ", "").split("+"))
+
+
+@pytest.mark.parametrize("args, expected", [
+    ((2078,), "B'CD + A'BC'D' + A'B'D + A'B'C"),
+    ((2077,), "B'CD + A'C'D' + A'B'D'"),
+    ((12309, True), "ABC' + A'C'D' + A'B'D'"),
+    ((2003,), "B'C' + AB'D' + A'C'D' + A'BC"),
+    ((255,), "1"),
+    ((0,), "0"),
+    (("ABC'D + A'B'CD' + ABC'D' + A'BC'D' + A'B'C'D'",), "ABC' + A'C'D' + A'B'D'"),
+    ((["ABC'D", "A'B'CD'", "ABC'D'", "A'BC'D'", "A'B'C'D'"],), "ABC' + A'C'D' + A'B'D'"),
+    (([743, [0, 1]],), "B'C'D + A'CD' + A'BD"),
+])
+def test_quinemc(args, expected):
+    assert _terms(quinemc(*args)) == _terms(expected)
+
+
+@pytest.mark.parametrize("args, expected", [
+    (("B'CD + A'C'D' + A'B'D'",), "AB'CD + A'BC'D' + A'B'CD' + A'B'CD + A'B'C'D'"),
+    ((["B'CD", "A'C'D'", "A'B'D'"],), "AB'CD + A'BC'D' + A'B'CD' + A'B'CD + A'B'C'D'"),
+    (("C + A",), "AC' + AC + A'C"),
+    (("C + A", 1), "ABC' + ABC + AB'C' + AB'C + A'BC + A'B'C"),
+    (("ry + t",), "rty' + rty + rt'y + r'ty' + r'ty"),
+])
+def test_to_cdnf(args, expected):
+    assert _terms(to_cdnf(*args)) == _terms(expected)
+
+
+@pytest.mark.parametrize("args, expected", [
+    (("A + BD'",), "ABD' + ABD + AB'D' + AB'D + A'BD'"),
+    (("A + BD'", True),
+     "ABCD' + ABCD + ABC'D' + ABC'D + AB'CD' + AB'CD + AB'C'D' + AB'C'D + A'BCD' + A'BC'D'"),
+    (("r + su'",), "rsu' + rsu + rs'u' + rs'u + r'su'"),
+    (("r + su'", True),
+     "rstu' + rstu + rst'u' + rst'u + rs'tu' + rs'tu + rs't'u' + rs't'u + r'stu' + r'st'u'"),
+    (("AB + D",), "ABD' + ABD + AB'D + A'BD + A'B'D"),
+    (("AB + D", True),
+     "ABCD' + ABCD + ABC'D' + ABC'D + AB'CD + AB'C'D + A'BCD + A'BC'D + A'B'CD + A'B'C'D"),
+    (("ABCDE'F + ABCDEF' + A'B'C'D'E'F'",), "ABCDEF' + ABCDE'F + A'B'C'D'E'F'"),
+    (("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",),
+     "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"),
+])
+def test_to_cdnf_order(args, expected):
+    assert to_cdnf(*args) == expected
+
+
+@pytest.mark.parametrize("expression", ["B'CD + A'C'D' + A'B'D'", "C + A", "ry + t"])
+def test_to_cdnf_list_matches_string(expression):
+    terms = expression.split(" + ")
+    assert to_cdnf(terms) == to_cdnf(expression)
+    assert to_cdnf(terms, True) == to_cdnf(expression, True)
+
+
+def test_full_results_are_not_shared():
+    r, s, t = quinemc(743, 1, 1)
+    rows, alts = len(s), alternatives(s, t)
+    s[0].termset.add("Z")
+    del s[1:]
+    t.clear()
+
+    r2, s2, t2 = quinemc(743, 1, 1)
+    assert r2 == r
+    assert len(s2) == rows and "Z" not in s2[0].termset
+    assert alternatives(s2, t2) == alts
+    assert quinemc(743) == r
+
+
+@pytest.mark.parametrize("n, expected, alts", [
+    (3350403033, "BC'E' + BC'D' + ACDE + ABDE' + AB'D' + A'D'E' + A'B'DE + A'B'CE'", [
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CE' + ABDE' + ACDE + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CE' + AB'CE + ABCD + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CE' + B'CDE + ABCD + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CE' + ABCD + ACDE + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CD + ABDE' + ACDE + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CD + AB'CE + ABCD + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CD + B'CDE + ABCD + AB'D'",
+        "A'B'DE + A'D'E' + BC'E' + BC'D' + A'B'CD + ABCD + ACDE + AB'D'"]),
+    (1157200204,
+     "CDE' + B'C'DE + ABDE' + AB'D'E' + AB'C + A'C'DE + A'BD'E' + A'BCD' + A'B'DE'", [
+        "AB'D'E' + A'BD'E' + A'BCD' + A'C'DE + ABDE' + AB'C + A'B'DE' + B'C'DE + CDE'",
+        "AB'D'E' + A'BD'E' + A'BCD' + A'C'DE + ABDE' + AB'C + A'B'DE' + AB'DE + CDE'",
+        "AB'D'E' + A'BD'E' + A'BCD' + A'C'DE + ABDE' + AB'C + A'B'C'D + B'C'DE + CDE'",
+        "AB'D'E' + A'BD'E' + A'BCD' + A'C'DE + ABDE' + AB'C + A'B'C'D + AB'DE + CDE'"]),
+])
+def test_quinemc_alternatives(n, expected, alts):
+    # Charts with rows and columns dominated by others, so both get trimmed before the
+    # cover search
+    r, s, t = quinemc(n, True, True)
+    assert r == expected
+    assert [_terms(alt) for alt in alternatives(s, t)] == [_terms(alt) for alt in alts]
+
+
+def test_quinemc_seven_letters():
+    # Big enough chart that the cover search has to prune to finish quickly
+    n = 71443919313006467319876364715437247515
+    r, s, t = quinemc(n, True, True)
+    assert len(t) == 40
+    assert _terms(to_cdnf(r)) == _terms(canonical(n))
+
+
+def test_canonical_thirteen_letters():
+    # Past 4096 bits the minterm names come from two half tables
+    n = 2 ** 5000 + 2 ** 4097 + 3
+    assert canonical(n) == (
+        "AB'C'DEFG'H'I'JK'L'M' + AB'C'D'E'F'G'H'I'J'K'L'M + "
+        "A'B'C'D'E'F'G'H'I'J'K'L'M' + A'B'C'D'E'F'G'H'I'J'K'L'M")
+    assert canonical(n, False) == (
+        "AB'C'D'E'F'G'H'I'J'K'L'M' + AB'C'D'E'F'G'H'I'J'K'L'M + "
+        "A'B'C'DE'F'G'HIJK'L'M + A'B'C'D'E'F'G'H'I'J'K'L'M'")
+    # 0 isn't False: A stays the high order bit
+    assert canonical(n, 0) == canonical(n, True)
+
+    terms = canonical(2 ** 8192 - 1 - 2 ** 4097).split(" + ")
+    assert len(terms) == 8191
+    assert terms[0] == "ABCDEFGHIJKLM'" and terms[-1] == "A'B'C'D'E'F'G'H'I'J'K'L'M"
+    assert "AB'C'D'E'F'G'H'I'J'K'L'M" not in terms
+    assert "AB'C'D'E'F'G'H'I'J'K'L'M'" in terms
+
+
+def test_highorder_a_only_false_is_low_order():
+    # 0 == False, but only False makes A the low order bit; the order of calls mustn't matter
+    assert canonical(248, False) == "ABC' + ABC + AB'C + A'BC + A'B'C"
+    assert canonical(248, 0) == "ABC' + ABC + AB'C' + AB'C + A'BC"
+    assert quinemc(743, False) == "B'C'D' + ACD' + AB'C' + A'BD'"
+    assert quinemc(743, 0) == "B'C'D + A'CD' + A'BD + A'B'D'"
 
 
 def test_quin():
     # a = qmc(2078)
-    assert isinstance(canonical("ABC"), ValueError)
+    with pytest.raises(ValueError):
+        canonical("ABC")
     assert canonical(2077, True, True) == "f(2077) = AB'CD + A'BC'D' + A'B'CD' + A'B'CD + A'B'C'D'"
-    Term = namedtuple('Term', 'termset used ones source generation final')
-    assert quinemc(2078) == "B'CD + A'BC'D' + A'B'D + A'B'C"
-    assert quinemc(2077) == "B'CD + A'C'D' + A'B'D'"
-    assert quinemc(12309, True) == "ABC' + A'C'D' + A'B'D'"
-    assert quinemc(2003) == "B'C' + AB'D' + A'C'D' + A'BC"
-    assert quinemc(255) == "1"
-    assert quinemc(0) == "0"
-
-    canon_list = ["ABC'D", "A'B'CD'", "ABC'D'", "A'BC'D'", "A'B'C'D'"]
-    canon_string = "ABC'D + A'B'CD' + ABC'D' + A'BC'D' + A'B'C'D'"
 
     canon_string_error = "ABCD + A'B'D' + ABC'D' + A'BC'D' + A'B'C'D'"
-    assert quinemc(canon_string) == "ABC' + A'C'D' + A'B'D'"
-    assert quinemc(canon_list) == "ABC' + A'C'D' + A'B'D'"
-    assert isinstance(quinemc({"ABC", "A'C"}), ValueError)
+    with pytest.raises(ValueError):
+        quinemc({"ABC", "A'C"})
 
-    assert to_cdnf("B'CD + A'C'D' + A'B'D'") == "AB'CD + A'BC'D' + A'B'CD' + A'B'CD + A'B'C'D'"
-    assert to_cdnf(["B'CD", "A'C'D'", "A'B'D'"]) == "AB'CD + A'BC'D' + A'B'CD' + A'B'CD + A'B'C'D'"
-    assert to_cdnf("C + A") == "AC' + AC + A'C"
-    assert to_cdnf("C + A", 1) == "ABC' + ABC + AB'C' + AB'C + A'BC + A'B'C"
-    assert to_cdnf("ry + t") == "rty' + rty + rt'y + r'ty' + r'ty"
+    with pytest.raises(ValueError):
+        to_cdnf(2077)
 
-    assert isinstance(to_cdnf(2077), ValueError)
+    with pytest.raises(ValueError):
+        quinemc(canon_string_error)
 
-    assert isinstance(quinemc(canon_string_error), ValueError)
+    with pytest.raises(ValueError):
+        quinemc("AAB + ABB")
     
-    second_result = ["A'D", "AB'C'", "B'CD'"]
     a, b, c = quinemc(2046, True, True)
-    c1 = c[1]
-    r = ["".join(sorted(ti.termset)) for ti in c1]
-    assert set(r) == set(second_result)
+    assert frozenset("".join(sorted(ti.termset)) for ti in c[1]) == _SECOND_2046
     assert len(b) == 26
 
     r, s, t = quinemc(743, 1, 1)
     assert result_to_int(s) == 743
-    assert alternatives(s, t)[2] == "B'C'D + A'B'D' + A'BC + A'BD"
-
-    assert quinemc([743, [0, 1]]) == "B'C'D + A'CD' + A'BD"
+    assert _terms(alternatives(s, t)[2]) == _terms("B'C'D + A'B'D' + A'BC + A'BD")
 
 
 